@@ -9,17 +9,30 @@ Produces comprehensive DTMF analysis with:
 - Full diagnostic report rendered to Jinja2 template
 """
 import argparse
+import io
 import os
 import glob
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from collections import Counter
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import scipy.fft
 import matplotlib
 matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from jinja2 import Environment, FileSystemLoader
 
+try:
+    import pyfftw
+except ImportError:  # pyfftw is optional; scipy's own FFT backend is used instead
+    pyfftw = None
+
+if pyfftw is not None:
+    # Every window is the same size, so cached FFTW plans are reused across calls
+    pyfftw.interfaces.cache.enable()
+    scipy.fft.set_global_backend(pyfftw.interfaces.scipy_fft)
+
 
 def find_most_recent_csv(base_path):
     """Find the most recent .csv file in base_path or base_path/logs"""
@@ -33,22 +46,133 @@ def find_most_recent_csv(base_path):
     return max(csv_files, key=os.path.getmtime)
 
 
-def goertzel(samples, target_freq, sample_rate):
-    """Goertzel algorithm - matches firmware implementation"""
-    n = len(samples)
-    k = int(0.5 + (n * target_freq) / sample_rate)
-    omega = (2.0 * np.pi * k) / n
-    coeff = 2.0 * np.cos(omega)
-    q0 = 0.0
-    q1 = 0.0
-    q2 = 0.0
-    for sample in samples:
-        q0 = coeff * q1 - q2 + float(sample)
-        q2 = q1
-        q1 = q0
-    real = q1 - q2 * np.cos(omega)
-    imag = q2 * np.sin(omega)
-    return np.sqrt(real * real + imag * imag)
+def load_samples(path):
+    """Load the int16 sample stream from a capture CSV
+
+    Rows are comma-separated samples and '#' lines carry capture metadata.
+    Captures usually end on a short row, which np.loadtxt rejects, so the rows
+    are joined into one comma-separated record and parsed in a single call.
+    """
+    with open(path, 'r') as f:
+        rows = [line.strip() for line in f]
+    record = ','.join(row for row in rows if row and not row.startswith('#'))
+    return np.loadtxt(io.StringIO(record), delimiter=',', dtype=np.int16, ndmin=1)
+
+
+def _signal_sums(data, clip_level):
+    """Min, max, sum, sum of squares and clipped count of an integer sample array"""
+    samples = data.astype(np.int64)
+    clipped = np.count_nonzero((samples > clip_level) | (samples < -clip_level))
+    return samples.min(), samples.max(), samples.sum(), samples @ samples, clipped
+
+
+def peak_abs(samples):
+    """Largest absolute sample value, without an abs() temporary or int16 wrap-around"""
+    return max(int(samples.max()), -int(samples.min()))
+
+
+def goertzel_bins(n, freqs, sample_rate):
+    """Integer DFT bin for each target frequency, rounded like the firmware"""
+    return np.floor(0.5 + (n * np.asarray(freqs, dtype=np.float64)) / sample_rate).astype(np.int64)
+
+
+def sliding_goertzel(data, freqs, window_n, starts, sample_rate):
+    """Goertzel output for the windows beginning at each sample offset in starts
+
+    A window's Goertzel magnitude is |X[k]| of that window's DFT, and X[k] for
+    the window starting at i is the difference of two prefix sums of
+    x[m] * exp(-2j*pi*k*m/N), rotated back by exp(2j*pi*k*i/N). Each frequency
+    costs one cumulative sum over the signal rather than a full recurrence per
+    window, so overlapping windows no longer revisit the same samples.
+
+    The cumulative sum runs a block at a time in one reused buffer, carrying
+    the running total across blocks, and only the sums at window edges are
+    kept, so memory does not grow with the length of the capture.
+    Returns the (real, imag) parts of X[k], shaped (len(starts), len(freqs)).
+    """
+    starts = np.asarray(starts)
+    edges = np.unique(np.concatenate((starts, starts + window_n)))
+    start_edge = np.searchsorted(edges, starts)
+    end_edge = np.searchsorted(edges, starts + window_n)
+    end = int(edges[-1]) if len(edges) else 0
+
+    # Blocks span whole twiddle periods, so one tiled period serves every block;
+    # a short signal gets a single block no longer than itself
+    block_n = window_n * max(1, min((1 << 20) // window_n, -(-end // window_n)))
+    buf = np.empty(block_n, dtype=np.complex128)
+    prefix = np.zeros(len(edges), dtype=np.complex128)
+    out = np.empty((len(starts), len(freqs)), dtype=np.complex128)
+    for col, k in enumerate(goertzel_bins(window_n, freqs, sample_rate)):
+        period = np.exp(-2j * np.pi * ((k * np.arange(window_n)) % window_n) / window_n)
+        twiddle = np.tile(period, block_n // window_n)
+        carry = 0
+        for b0 in range(0, end, block_n):
+            seg = buf[:min(block_n, end - b0)]
+            np.multiply(data[b0:b0 + len(seg)], twiddle[:len(seg)], out=seg)
+            seg[0] += carry
+            np.cumsum(seg, out=seg)
+            carry = seg[-1]
+            lo, hi = np.searchsorted(edges, [b0, b0 + len(seg)], side='right')
+            prefix[lo:hi] = seg[edges[lo:hi] - b0 - 1]
+        out[:, col] = (prefix[end_edge] - prefix[start_edge]) * np.conj(period[starts % window_n])
+    return out.real, out.imag
+
+
+def band_slice(freqs, lo_hz, hi_hz):
+    """Slice of the sorted FFT bin frequencies with lo_hz <= f <= hi_hz"""
+    return slice(int(np.searchsorted(freqs, lo_hz, side='left')),
+                 int(np.searchsorted(freqs, hi_hz, side='right')))
+
+
+def band_peaks(mag, band, freqs):
+    """Peak frequency and magnitude inside the band slice for every row of a magnitude matrix"""
+    if band.start >= band.stop:
+        return np.zeros(len(mag)), np.zeros(len(mag))
+    peak_i = band.start + np.argmax(mag[:, band], axis=1)
+    return freqs[peak_i], mag[np.arange(len(mag)), peak_i]
+
+
+def twist(low_mag, high_mag):
+    """Ratio of the stronger band to the weaker one; works elementwise on arrays"""
+    return np.maximum(low_mag, high_mag) / np.maximum(np.minimum(low_mag, high_mag), 1e-10)
+
+
+def table_rows(columns):
+    """Row dicts of a column-wise table, built one at a time as they are iterated"""
+    return (dict(zip(columns, row)) for row in zip(*columns.values()))
+
+
+def value_counts(values):
+    """Count of each distinct value, keyed in order of first appearance like a Counter"""
+    uniq, first, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.argsort(first)
+    return dict(zip(uniq[order].tolist(), counts[order].tolist()))
+
+
+def band_counts(positions, n_positions=4):
+    """Count of each filter position within a band, keyed in first-seen order like value_counts
+
+    Positions are small integers, so np.bincount tallies them without the sort
+    np.unique needs.
+    """
+    counts = np.bincount(positions, minlength=n_positions)
+    first = np.full(n_positions, len(positions))
+    np.minimum.at(first, positions, np.arange(len(positions)))
+    return {int(i): int(counts[i]) for i in np.argsort(first) if counts[i]}
+
+
+def top_counts(counts, n):
+    """The n most frequent (value, count) pairs of a first-seen-ordered count dict
+
+    The sort is stable, so ties go to the earliest value, like
+    Counter.most_common.
+    """
+    return sorted(counts.items(), key=lambda item: -item[1])[:n]
+
+
+def most_common(counts):
+    """Most frequent value and its count"""
+    return top_counts(counts, 1)[0]
 
 
 # ========================================================================
@@ -62,6 +186,14 @@ DTMF_MAP = {
     (852, 1209): '7', (852, 1336): '8', (852, 1477): '9', (852, 1633): 'C',
     (941, 1209): '*', (941, 1336): '0', (941, 1477): '#', (941, 1633): 'D',
 }
+# Same keypad as DTMF_MAP, indexed by [low_idx, high_idx] band positions
+DTMF_DIGITS = np.array([[DTMF_MAP[(lo, hi)] for hi in DTMF_HIGH] for lo in DTMF_LOW])
+DTMF_LOW_HZ = np.array(DTMF_LOW)
+DTMF_HIGH_HZ = np.array(DTMF_HIGH)
+# Midpoints between neighbouring tones; np.searchsorted against these gives the
+# index of the nearest tone (ties go to the lower one, like min(key=abs))
+DTMF_LOW_MIDS = (DTMF_LOW_HZ[:-1] + DTMF_LOW_HZ[1:]) / 2
+DTMF_HIGH_MIDS = (DTMF_HIGH_HZ[:-1] + DTMF_HIGH_HZ[1:]) / 2
 
 # ========================================================================
 # PARSE ARGS & LOAD DATA
@@ -69,6 +201,9 @@ DTMF_MAP = {
 parser = argparse.ArgumentParser(description='Analyze captured audio data from Bowie Phone')
 parser.add_argument('--input', type=str, help='Path to input CSV file')
 parser.add_argument('--output', type=str, help='Output directory for generated files')
+parser.add_argument('--skip-quiet', action='store_true',
+                    help='Only run FFT/Goertzel on windows above the energy gate '
+                         '(faster on long captures; noise-window diagnostics are omitted)')
 args = parser.parse_args()
 
 script_dir = Path(__file__).parent.absolute()
@@ -96,14 +231,7 @@ template_data = {
 }
 
 print("Loading audio data...")
-data = []
-with open(input_csv, 'r') as f:
-    for line in f:
-        line = line.strip()
-        if line and not line.startswith('#'):
-            values = [int(x) for x in line.split(',')]
-            data.extend(values)
-data = np.array(data, dtype=np.int16)
+data = load_samples(input_csv)
 
 rate = 22050
 duration_sec = len(data) / rate
@@ -112,15 +240,17 @@ time_axis = np.arange(len(data)) / rate
 # ========================================================================
 # BASIC STATISTICS
 # ========================================================================
-min_val = int(np.min(data))
-max_val = int(np.max(data))
-mean_val = float(np.mean(data))
-std_val = float(np.std(data))
+lo, hi, total, total_sq, clipped = _signal_sums(data, 32000)
+min_val = int(lo)
+max_val = int(hi)
+mean_val = float(total / len(data))
+mean_sq = float(total_sq / len(data))
+std_val = float(np.sqrt(max(mean_sq - mean_val * mean_val, 0.0)))
 peak_amplitude = int(max(abs(min_val), abs(max_val)))
 peak_dbfs = float(20 * np.log10(peak_amplitude / 32768))
-rms_total = float(np.sqrt(np.mean(data.astype(np.float64)**2)))
+rms_total = float(np.sqrt(mean_sq))
 rms_dbfs = float(20 * np.log10(rms_total / 32768))
-clipped = int(np.sum(np.abs(data) > 32000))
+clipped = int(clipped)
 clipped_pct = float(100 * clipped / len(data))
 
 template_data.update({
@@ -138,20 +268,24 @@ print(f"Loaded {len(data):,} samples, {duration_sec:.2f}s at {rate} Hz")
 # ========================================================================
 num_seconds = int(np.ceil(duration_sec))
 waveform_images = []
+# One figure for every second - only the line data, limits and title change
+fig = Figure(figsize=(18, 3))
+ax = fig.subplots(1, 1)
+waveform_line, = ax.plot([], [], linewidth=0.5)
+ax.set_xlabel('Time (s)')
+ax.set_ylabel('Amplitude')
+ax.grid(True, alpha=0.3)
 for sec in range(num_seconds):
     s0 = sec * rate
     s1 = min((sec + 1) * rate, len(data))
-    fig, ax = plt.subplots(1, 1, figsize=(18, 3))
-    ax.plot(time_axis[s0:s1], data[s0:s1], linewidth=0.5)
-    ax.set_xlabel('Time (s)')
-    ax.set_ylabel('Amplitude')
-    ax.set_title(f'Second {sec} ({sec:.1f}s - {sec+1:.1f}s)')
-    ax.grid(True, alpha=0.3)
+    waveform_line.set_data(time_axis[s0:s1], data[s0:s1])
+    ax.relim()
+    ax.autoscale_view(scalex=False)
     ax.set_xlim(sec, sec + 1)
-    plt.tight_layout()
+    ax.set_title(f'Second {sec} ({sec:.1f}s - {sec+1:.1f}s)')
+    fig.tight_layout()
     fn = f'audio_sec_{sec:02d}.png'
-    plt.savefig(str(output_dir / fn), dpi=150)
-    plt.close()
+    fig.savefig(str(output_dir / fn), dpi=100)
     waveform_images.append({
         'second': sec, 'filename': fn,
         'start_time': f"{sec:.1f}s", 'end_time': f"{sec+1:.1f}s",
@@ -173,91 +307,114 @@ print("Running per-window spectral analysis...")
 window_ms = 250
 window_n = int(window_ms * rate / 1000)   # 5512 samples
 hop_n = window_n // 2                      # 50% overlap
-
-win_freqs = np.fft.rfftfreq(window_n, 1.0 / rate)
-low_band_idx = np.where((win_freqs >= 650) & (win_freqs <= 1000))[0]
-high_band_idx = np.where((win_freqs >= 1150) & (win_freqs <= 1700))[0]
-
-windows = []
-
-for i in range(0, len(data) - window_n, hop_n):
-    chunk = data[i:i + window_n].astype(np.float64)
-    t_center = (i + window_n // 2) / rate
-
-    w_rms = np.sqrt(np.mean(chunk ** 2))
-    w_rms_db = 20 * np.log10(w_rms / 32768 + 1e-15)
-
-    spectrum = np.fft.rfft(chunk * np.hanning(window_n))
-    mag = np.abs(spectrum)
-
-    low_mag_max = 0.0
-    low_peak_hz = 0.0
-    if len(low_band_idx) > 0:
-        li = low_band_idx[np.argmax(mag[low_band_idx])]
-        low_mag_max = float(mag[li])
-        low_peak_hz = float(win_freqs[li])
-
-    high_mag_max = 0.0
-    high_peak_hz = 0.0
-    if len(high_band_idx) > 0:
-        hi = high_band_idx[np.argmax(mag[high_band_idx])]
-        high_mag_max = float(mag[hi])
-        high_peak_hz = float(win_freqs[hi])
-
-    goertzel_low = [goertzel(chunk, f, rate) for f in DTMF_LOW]
-    goertzel_high = [goertzel(chunk, f, rate) for f in DTMF_HIGH]
-
-    windows.append({
-        'time': t_center,
-        'rms': w_rms,
-        'rms_db': w_rms_db,
-        'low_peak_hz': low_peak_hz,
-        'low_peak_mag': low_mag_max,
-        'high_peak_hz': high_peak_hz,
-        'high_peak_mag': high_mag_max,
-        'goertzel_low': goertzel_low,
-        'goertzel_high': goertzel_high,
-    })
-
-print(f"Analyzed {len(windows)} windows ({window_ms}ms, 50% overlap)")
+hann = np.hanning(window_n).astype(np.float32)
+
+win_freqs = scipy.fft.rfftfreq(window_n, 1.0 / rate)
+# FFT bins are sorted, so each band is a contiguous slice (a view, not a copy)
+low_band = band_slice(win_freqs, 650, 1000)
+high_band = band_slice(win_freqs, 1150, 1700)
+
+# Frame the signal into an (n_windows, window_n) view and transform the windows
+# with batched rffts instead of one FFT call per window. float32 is
+# plenty for peak picking and halves the memory traffic of the FFT path
+# (scipy.fft keeps the dtype, so the spectra come back as complex64).
+n_windows = len(range(0, len(data) - window_n, hop_n))
+window_starts = np.arange(n_windows) * hop_n
+data_f32 = data.astype(np.float32)
+frames = sliding_window_view(data_f32, window_n)[::hop_n][:n_windows]
+w_times = (window_starts + window_n // 2) / rate
+
+# Window energies from a running sum of squares: exact in int64 and O(1) per
+# window, instead of squaring every overlapping frame again
+sq_cumsum = np.concatenate(([0], np.cumsum(data.astype(np.int64) ** 2)))
+w_rms = np.sqrt((sq_cumsum[window_starts + window_n] - sq_cumsum[window_starts]) / window_n)
+w_rms_db = 20 * np.log10(w_rms / 32768 + 1e-15)
 
 # Energy gate
 energy_threshold_db = -20.0
-active_windows = [w for w in windows if w['rms_db'] >= energy_threshold_db]
-noise_windows = [w for w in windows if w['rms_db'] < energy_threshold_db]
-print(f"Active windows (>= {energy_threshold_db} dBFS): {len(active_windows)} / {len(windows)}")
+active_mask = w_rms_db >= energy_threshold_db
+active_idx = np.flatnonzero(active_mask)
+noise_idx = np.flatnonzero(~active_mask)
+
+# Run edges of the active mask: starts at even positions, (exclusive) ends at
+# odd ones. Each run is one contiguous stretch of active windows.
+run_edges = np.flatnonzero(np.diff(active_mask.astype(np.int8), prepend=0, append=0))
+region_runs = list(zip(run_edges[::2].tolist(), run_edges[1::2].tolist()))
+
+# With --skip-quiet only the windows above the gate are transformed; the rest
+# keep zero spectra and Goertzel output so every array stays indexed by window.
+spectral_rows = active_idx if args.skip_quiet else np.arange(n_windows)
+noise_spectra = len(noise_idx) > 0 and not args.skip_quiet
+
+# Transform in blocks of rows so the windowed copy and complex spectra of a long
+# capture stay around 64 MB at a time instead of growing with its length
+fft_block = max(1, (64 << 20) // (window_n * data_f32.itemsize))
+spectra = np.zeros((n_windows, len(win_freqs)), dtype=np.float32)
+for i in range(0, len(spectral_rows), fft_block):
+    block = spectral_rows[i:i + fft_block]
+    windowed = frames[block]
+    windowed *= hann
+    spectra[block] = np.abs(scipy.fft.rfft(windowed, axis=1, workers=-1))
+low_peak_hz, low_peak_mag = band_peaks(spectra, low_band, win_freqs)
+high_peak_hz, high_peak_mag = band_peaks(spectra, high_band, win_freqs)
+if args.skip_quiet:
+    low_peak_hz[noise_idx] = 0
+    high_peak_hz[noise_idx] = 0
+
+# The linear spectra are only needed for the band peaks above; convert the
+# matrix to dB in place once so the spectrum plots can slice rows from it.
+spectra_db = spectra
+spectra_db += 1e-10
+np.log10(spectra_db, out=spectra_db)
+spectra_db *= 20
+
+goertzel_mags = np.zeros((n_windows, len(DTMF_LOW) + len(DTMF_HIGH)))
+if args.skip_quiet:
+    # The sliding DFT sweeps every sample it is given, so hand it only the
+    # stretch of the capture under each active run
+    for start, end in region_runs:
+        span = data[window_starts[start]:window_starts[end - 1] + window_n]
+        run_starts = window_starts[start:end] - window_starts[start]
+        goertzel_mags[start:end] = np.hypot(*sliding_goertzel(span, DTMF_LOW + DTMF_HIGH, window_n,
+                                                                run_starts, rate))
+else:
+    goertzel_mags[:] = np.hypot(*sliding_goertzel(data, DTMF_LOW + DTMF_HIGH, window_n,
+                                                    window_starts, rate))
+
+# Per-window results stay as parallel arrays indexed by window number;
+# the Goertzel matrix columns are the low band followed by the high band.
+# Each band's winning filter and its magnitude are shared by every section
+# below; viewing the contiguous matrix as (window, band, filter) finds both
+# bands' winners in a single reduction.
+goertzel_bands = goertzel_mags.reshape(n_windows, 2, 4)
+goertzel_band_arg = goertzel_bands.argmax(axis=2)
+goertzel_band_max = np.take_along_axis(goertzel_bands, goertzel_band_arg[:, :, None], axis=2)[:, :, 0]
+goertzel_low_arg, goertzel_high_arg = goertzel_band_arg.T
+goertzel_low_max, goertzel_high_max = goertzel_band_max.T
+goertzel_peak = goertzel_band_max.max(axis=1)
+
+print(f"Analyzed {n_windows} windows ({window_ms}ms, 50% overlap)")
+print(f"Active windows (>= {energy_threshold_db} dBFS): {len(active_idx)} / {n_windows}")
 
 template_data['energy_threshold_db'] = energy_threshold_db
-template_data['num_windows'] = len(windows)
-template_data['num_active_windows'] = len(active_windows)
+template_data['num_windows'] = n_windows
+template_data['num_active_windows'] = len(active_idx)
 
 # ========================================================================
 # FIND TONE REGIONS (contiguous active stretches)
 # ========================================================================
-tone_regions = []
-in_region = False
-region_start = None
-for w in windows:
-    if w['rms_db'] >= energy_threshold_db:
-        if not in_region:
-            in_region = True
-            region_start = w['time']
-    else:
-        if in_region:
-            in_region = False
-            tone_regions.append((region_start, w['time']))
-if in_region:
-    tone_regions.append((region_start, windows[-1]['time']))
+# Each run of the energy gate is a region. It ends at the first quiet window,
+# or the last window if the capture ends mid-tone.
+tone_regions = [(float(w_times[start]), float(w_times[min(end, n_windows - 1)]))
+                for start, end in region_runs]
 
 template_data['tone_regions'] = [{'start': s, 'end': e, 'duration': e - s}
                                   for s, e in tone_regions]
 
-# Pick the highest-energy window from each region as representative
-representative_windows = []
-for r_start, r_end in tone_regions:
-    region_wins = [w for w in windows if r_start <= w['time'] <= r_end]
-    if region_wins:
-        representative_windows.append(max(region_wins, key=lambda w: w['rms']))
+# Pick the highest-energy window from each region as representative. Each
+# region is a run of window indices, so it is sliced directly rather than
+# found by comparing every window time against the region bounds.
+representative_windows = [start + int(np.argmax(w_rms[start:end])) for start, end in region_runs]
 
 # ========================================================================
 # PLOT 1: SPECTRUM OF REPRESENTATIVE TONE WINDOWS
@@ -267,17 +424,17 @@ for r_start, r_end in tone_regions:
 # ========================================================================
 print("Generating spectrum plots of peak-energy windows...")
 
-spectrum_plots = []
-spectrum_details = []
-for idx, rep_w in enumerate(representative_windows):
-    sample_start = int((rep_w['time'] - window_ms / 2000) * rate)
-    sample_start = max(0, sample_start)
-    chunk = data[sample_start:sample_start + window_n].astype(np.float64)
-    spectrum = np.fft.rfft(chunk * np.hanning(window_n))
-    mag = np.abs(spectrum)
-    mag_db = 20 * np.log10(mag + 1e-10)
 
-    fig, ax = plt.subplots(1, 1, figsize=(18, 6))
+def render_spectrum_plot(idx, rep_j):
+    """Plot representative window rep_j's spectrum, returning (filename, detail)
+
+    Builds its own Figure instead of going through pyplot so several plots can
+    render at once on worker threads.
+    """
+    mag_db = spectra_db[rep_j]
+
+    fig = Figure(figsize=(18, 6))
+    ax = fig.subplots(1, 1)
 
     freq_mask = (win_freqs >= 50) & (win_freqs <= 2500)
     ax.plot(win_freqs[freq_mask], mag_db[freq_mask], linewidth=0.8, color='black')
@@ -291,13 +448,13 @@ for idx, rep_w in enumerate(representative_windows):
         ax.axvline(x=f, color='red', linestyle=':', alpha=0.5, linewidth=0.7)
 
     detail = {
-        'time': rep_w['time'],
-        'rms_db': rep_w['rms_db'],
+        'time': float(w_times[rep_j]),
+        'rms_db': float(w_rms_db[rep_j]),
         'tone_region': idx + 1,
     }
 
-    low_peak_i = low_band_idx[np.argmax(mag[low_band_idx])] if len(low_band_idx) > 0 else None
-    high_peak_i = high_band_idx[np.argmax(mag[high_band_idx])] if len(high_band_idx) > 0 else None
+    low_peak_i = low_band.start + np.argmax(mag_db[low_band]) if low_band.start < low_band.stop else None
+    high_peak_i = high_band.start + np.argmax(mag_db[high_band]) if high_band.start < high_band.stop else None
 
     if low_peak_i is not None:
         lf = win_freqs[low_peak_i]
@@ -309,7 +466,8 @@ for idx, rep_w in enumerate(representative_windows):
                     bbox=dict(boxstyle='round,pad=0.3', facecolor='lightyellow', edgecolor='blue'))
         detail['low_freq_hz'] = float(lf)
         detail['low_mag_db'] = float(lm)
-        nearest_low = min(DTMF_LOW, key=lambda df: abs(df - lf))
+        nearest_low_i = np.searchsorted(DTMF_LOW_MIDS, lf)
+        nearest_low = DTMF_LOW[nearest_low_i]
         detail['nearest_dtmf_low'] = nearest_low
         detail['low_offset_hz'] = round(float(lf - nearest_low), 1)
 
@@ -323,30 +481,38 @@ for idx, rep_w in enumerate(representative_windows):
                     bbox=dict(boxstyle='round,pad=0.3', facecolor='lightyellow', edgecolor='red'))
         detail['high_freq_hz'] = float(hf)
         detail['high_mag_db'] = float(hm)
-        nearest_high = min(DTMF_HIGH, key=lambda df: abs(df - hf))
+        nearest_high_i = np.searchsorted(DTMF_HIGH_MIDS, hf)
+        nearest_high = DTMF_HIGH[nearest_high_i]
         detail['nearest_dtmf_high'] = nearest_high
         detail['high_offset_hz'] = round(float(hf - nearest_high), 1)
 
     if 'nearest_dtmf_low' in detail and 'nearest_dtmf_high' in detail:
-        digit = DTMF_MAP.get((detail['nearest_dtmf_low'], detail['nearest_dtmf_high']), '?')
-        detail['decoded_digit'] = digit
+        detail['decoded_digit'] = DTMF_DIGITS[nearest_low_i, nearest_high_i].item()
 
     ax.set_xlabel('Frequency (Hz)', fontsize=12)
     ax.set_ylabel('Magnitude (dB)', fontsize=12)
-    ax.set_title(f'Spectrum at t={rep_w["time"]:.2f}s  —  Tone Region {idx+1}  —  '
+    ax.set_title(f'Spectrum at t={w_times[rep_j]:.2f}s  —  Tone Region {idx+1}  —  '
                  f'Low: {detail.get("low_freq_hz", 0):.1f} Hz  +  High: {detail.get("high_freq_hz", 0):.1f} Hz'
                  f'  →  DTMF "{detail.get("decoded_digit", "?")}"',
                  fontsize=13)
     ax.legend(loc='upper right', fontsize=11)
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
+    fig.tight_layout()
     fn = f'spectrum_tone_{idx+1}.png'
-    plt.savefig(str(output_dir / fn), dpi=150)
-    plt.close()
+    fig.savefig(str(output_dir / fn), dpi=150)
+    return fn, detail
+
+
+spectrum_plots = []
+spectrum_details = []
+with ThreadPoolExecutor(max_workers=4) as pool:
+    rendered = list(pool.map(render_spectrum_plot,
+                             range(len(representative_windows)), representative_windows))
+for fn, detail in rendered:
     spectrum_plots.append(fn)
     spectrum_details.append(detail)
-    print(f"  Tone {idx+1} at {rep_w['time']:.2f}s: "
+    print(f"  Tone {detail['tone_region']} at {detail['time']:.2f}s: "
           f"Low={detail.get('low_freq_hz', 0):.1f} Hz, "
           f"High={detail.get('high_freq_hz', 0):.1f} Hz "
           f"-> '{detail.get('decoded_digit', '?')}'")
@@ -362,21 +528,17 @@ template_data['spectrum_details'] = spectrum_details
 # ========================================================================
 print("Generating frequency pair timeline...")
 
-fig, axes = plt.subplots(3, 1, figsize=(18, 14), sharex=True,
-                          gridspec_kw={'height_ratios': [3, 3, 1.5]})
-
-times = [w['time'] for w in windows]
-is_active = [w['rms_db'] >= energy_threshold_db for w in windows]
+fig = Figure(figsize=(18, 14))
+axes = fig.subplots(3, 1, sharex=True, gridspec_kw={'height_ratios': [3, 3, 1.5]})
 
-active_t = [t for t, a in zip(times, is_active) if a]
-active_lf = [w['low_peak_hz'] for w, a in zip(windows, is_active) if a]
-active_hf = [w['high_peak_hz'] for w, a in zip(windows, is_active) if a]
-active_lm = [w['low_peak_mag'] for w, a in zip(windows, is_active) if a]
-active_hm = [w['high_peak_mag'] for w, a in zip(windows, is_active) if a]
-inactive_t = [t for t, a in zip(times, is_active) if not a]
-inactive_lf = [w['low_peak_hz'] for w, a in zip(windows, is_active) if not a]
-inactive_hf = [w['high_peak_hz'] for w, a in zip(windows, is_active) if not a]
-rms_dbs = [w['rms_db'] for w in windows]
+active_t = w_times[active_mask]
+active_lf = low_peak_hz[active_mask]
+active_hf = high_peak_hz[active_mask]
+active_lm = low_peak_mag[active_mask]
+active_hm = high_peak_mag[active_mask]
+inactive_t = w_times[~active_mask]
+inactive_lf = low_peak_hz[~active_mask]
+inactive_hf = high_peak_hz[~active_mask]
 
 # Top: Low band peaks
 ax1 = axes[0]
@@ -384,12 +546,12 @@ for f in DTMF_LOW:
     ax1.axhline(y=f, color='blue', linestyle='--', alpha=0.4, linewidth=1.0)
     ax1.text(duration_sec + 0.05, f, f'{f} Hz', fontsize=9, color='blue', va='center')
 
-if active_lm:
+if len(active_lm):
     scatter1 = ax1.scatter(active_t, active_lf,
-                           c=np.log10(np.array(active_lm) + 1),
+                           c=np.log10(active_lm + 1),
                            cmap='YlOrRd', s=40, zorder=5, edgecolors='black', linewidth=0.5)
-    plt.colorbar(scatter1, ax=ax1, label='log10(magnitude)', shrink=0.8)
-if inactive_lf:
+    fig.colorbar(scatter1, ax=ax1, label='log10(magnitude)', shrink=0.8)
+if len(inactive_lf):
     ax1.scatter(inactive_t, inactive_lf, c='lightgray', s=10, alpha=0.3, zorder=2)
 
 ax1.axhspan(650, 1000, alpha=0.06, color='blue')
@@ -404,12 +566,12 @@ for f in DTMF_HIGH:
     ax2.axhline(y=f, color='red', linestyle='--', alpha=0.4, linewidth=1.0)
     ax2.text(duration_sec + 0.05, f, f'{f} Hz', fontsize=9, color='red', va='center')
 
-if active_hm:
+if len(active_hm):
     scatter2 = ax2.scatter(active_t, active_hf,
-                           c=np.log10(np.array(active_hm) + 1),
+                           c=np.log10(active_hm + 1),
                            cmap='YlOrRd', s=40, zorder=5, edgecolors='black', linewidth=0.5)
-    plt.colorbar(scatter2, ax=ax2, label='log10(magnitude)', shrink=0.8)
-if inactive_hf:
+    fig.colorbar(scatter2, ax=ax2, label='log10(magnitude)', shrink=0.8)
+if len(inactive_hf):
     ax2.scatter(inactive_t, inactive_hf, c='lightgray', s=10, alpha=0.3, zorder=2)
 
 ax2.axhspan(1150, 1700, alpha=0.06, color='red')
@@ -420,8 +582,8 @@ ax2.grid(True, alpha=0.3)
 
 # Bottom: Energy
 ax3 = axes[2]
-ax3.fill_between(times, rms_dbs, -80, alpha=0.3, color='purple')
-ax3.plot(times, rms_dbs, linewidth=1, color='purple')
+ax3.fill_between(w_times, w_rms_db, -80, alpha=0.3, color='purple')
+ax3.plot(w_times, w_rms_db, linewidth=1, color='purple')
 ax3.axhline(y=energy_threshold_db, color='green', linestyle='--', linewidth=1.5,
             label=f'Energy gate ({energy_threshold_db} dBFS)')
 ax3.set_ylabel('RMS (dBFS)', fontsize=12)
@@ -430,10 +592,9 @@ ax3.set_title('Window Energy — colored dots above are active; gray are noise',
 ax3.legend(loc='upper right')
 ax3.grid(True, alpha=0.3)
 
-plt.tight_layout()
+fig.tight_layout()
 fn = 'frequency_pair_timeline.png'
-plt.savefig(str(output_dir / fn), dpi=150)
-plt.close()
+fig.savefig(str(output_dir / fn), dpi=150)
 template_data['freq_pair_plot'] = fn
 print(f"Saved: {fn}")
 
@@ -447,18 +608,18 @@ print("Generating Goertzel heatmap...")
 all_dtmf = DTMF_LOW + DTMF_HIGH
 all_labels = [f'{f} Hz' for f in all_dtmf]
 
-goertzel_matrix = np.zeros((8, len(windows)))
-for j, w in enumerate(windows):
-    for k in range(4):
-        goertzel_matrix[k, j] = w['goertzel_low'][k]
-        goertzel_matrix[k + 4, j] = w['goertzel_high'][k]
-
+# Rows are the 8 DTMF filters (low band then high band), columns are windows
+goertzel_matrix = goertzel_mags.T
 goertzel_db = 20 * np.log10(goertzel_matrix + 1e-10)
+if args.skip_quiet:
+    # Gated windows have no Goertzel output; leave them blank rather than
+    # drawing them as -200 dB
+    goertzel_db = np.ma.masked_where(np.broadcast_to(~active_mask, goertzel_db.shape), goertzel_db)
 
-fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(18, 10),
-                                gridspec_kw={'height_ratios': [4, 1]}, sharex=True)
+fig = Figure(figsize=(18, 10))
+ax1, ax2 = fig.subplots(2, 1, gridspec_kw={'height_ratios': [4, 1]}, sharex=True)
 
-times_arr = np.array(times)
+times_arr = w_times
 # pcolormesh with shading='flat' needs len(X) = C.shape[1]+1
 half_step = (times_arr[1] - times_arr[0]) / 2 if len(times_arr) > 1 else 0.0625
 time_edges = np.concatenate([times_arr - half_step, [times_arr[-1] + half_step]])
@@ -473,20 +634,19 @@ ax1.text(-0.3, 6, 'HIGH\nBAND', fontsize=11, fontweight='bold', color='orange',
          ha='center', va='center')
 ax1.set_title('Goertzel Magnitude Per DTMF Frequency Over Time — What The Detector Sees',
               fontsize=14)
-cbar = plt.colorbar(im, ax=ax1)
+cbar = fig.colorbar(im, ax=ax1)
 cbar.set_label('Magnitude (dB)', fontsize=11)
 
-ax2.fill_between(times, rms_dbs, -80, alpha=0.3, color='purple')
-ax2.plot(times, rms_dbs, linewidth=1, color='purple')
+ax2.fill_between(w_times, w_rms_db, -80, alpha=0.3, color='purple')
+ax2.plot(w_times, w_rms_db, linewidth=1, color='purple')
 ax2.axhline(y=energy_threshold_db, color='green', linestyle='--', linewidth=1.5)
 ax2.set_ylabel('RMS (dBFS)')
 ax2.set_xlabel('Time (s)')
 ax2.grid(True, alpha=0.3)
 
-plt.tight_layout()
+fig.tight_layout()
 fn = 'goertzel_heatmap.png'
-plt.savefig(str(output_dir / fn), dpi=150)
-plt.close()
+fig.savefig(str(output_dir / fn), dpi=150)
 template_data['goertzel_heatmap'] = fn
 print(f"Saved: {fn}")
 
@@ -495,22 +655,26 @@ print(f"Saved: {fn}")
 # ========================================================================
 print("Generating Goertzel detail bar charts...")
 
+# One figure serves every bar chart; clearing the axes is much cheaper than
+# building and tearing down a figure per tone region.
+fig = Figure(figsize=(12, 5))
+ax = fig.subplots(1, 1)
 goertzel_detail_plots = []
-for idx, rep_w in enumerate(representative_windows):
-    fig, ax = plt.subplots(1, 1, figsize=(12, 5))
+for idx, rep_j in enumerate(representative_windows):
+    ax.clear()
 
-    mags = list(rep_w['goertzel_low']) + list(rep_w['goertzel_high'])
+    mags = goertzel_mags[rep_j]
     colors = ['#2196F3'] * 4 + ['#F44336'] * 4
     ax.bar(range(8), mags, color=colors, edgecolor='black', linewidth=0.5)
 
     ax.set_xticks(range(8))
     ax.set_xticklabels([f'{f} Hz' for f in all_dtmf], fontsize=11, rotation=45)
     ax.set_ylabel('Goertzel Magnitude', fontsize=12)
-    ax.set_title(f'Goertzel Response at t={rep_w["time"]:.2f}s (Tone Region {idx+1})', fontsize=14)
+    ax.set_title(f'Goertzel Response at t={w_times[rep_j]:.2f}s (Tone Region {idx+1})', fontsize=14)
     ax.grid(True, axis='y', alpha=0.3)
 
-    low_winner = int(np.argmax(rep_w['goertzel_low']))
-    high_winner = int(np.argmax(rep_w['goertzel_high'])) + 4
+    low_winner = int(goertzel_low_arg[rep_j])
+    high_winner = int(goertzel_high_arg[rep_j]) + 4
     for winner_idx in [low_winner, high_winner]:
         ax.annotate(f'{all_dtmf[winner_idx]} Hz\n{mags[winner_idx]:,.0f}',
                     xy=(winner_idx, mags[winner_idx]),
@@ -518,19 +682,17 @@ for idx, rep_w in enumerate(representative_windows):
                     fontsize=11, fontweight='bold', ha='center', color='black',
                     bbox=dict(boxstyle='round,pad=0.2', facecolor='lightyellow', edgecolor='gray'))
 
-    low_f = DTMF_LOW[int(np.argmax(rep_w['goertzel_low']))]
-    high_f = DTMF_HIGH[int(np.argmax(rep_w['goertzel_high']))]
-    digit = DTMF_MAP.get((low_f, high_f), '?')
+    low_f = DTMF_LOW[low_winner]
+    high_f = DTMF_HIGH[high_winner - 4]
+    digit = DTMF_DIGITS[low_winner, high_winner - 4]
     ax.text(0.98, 0.95, f'Decoded: {low_f}+{high_f} = "{digit}"',
             transform=ax.transAxes, fontsize=14, fontweight='bold',
             ha='right', va='top',
             bbox=dict(boxstyle='round,pad=0.5', facecolor='lightyellow',
                       edgecolor='green', linewidth=2))
 
-    plt.tight_layout()
     fn = f'goertzel_detail_tone_{idx+1}.png'
-    plt.savefig(str(output_dir / fn), dpi=150)
-    plt.close()
+    fig.savefig(str(output_dir / fn), dpi=100, bbox_inches='tight', pad_inches=0.05)
     goertzel_detail_plots.append(fn)
 
 template_data['goertzel_detail_plots'] = goertzel_detail_plots
@@ -541,13 +703,14 @@ print(f"Saved {len(goertzel_detail_plots)} Goertzel detail plots")
 # ========================================================================
 print("Generating band magnitude comparison...")
 
-fig, axes = plt.subplots(2, 1, figsize=(18, 10), sharex=True)
+fig = Figure(figsize=(18, 10))
+axes = fig.subplots(2, 1, sharex=True)
 bar_width = (window_n / rate) * 0.35
 
 ax = axes[0]
-ax.bar([t - bar_width/2 for t in times], [w['low_peak_mag'] for w in windows],
+ax.bar(w_times - bar_width/2, low_peak_mag,
        width=bar_width, label='Low Band Peak', color='#2196F3', alpha=0.8)
-ax.bar([t + bar_width/2 for t in times], [w['high_peak_mag'] for w in windows],
+ax.bar(w_times + bar_width/2, high_peak_mag,
        width=bar_width, label='High Band Peak', color='#F44336', alpha=0.8)
 ax.set_ylabel('FFT Magnitude (linear)')
 ax.set_title('FFT Peak Magnitudes: Low Band vs High Band Per Window')
@@ -556,11 +719,9 @@ ax.grid(True, alpha=0.3)
 ax.legend()
 
 ax = axes[1]
-g_low_winners = [max(w['goertzel_low']) for w in windows]
-g_high_winners = [max(w['goertzel_high']) for w in windows]
-ax.bar([t - bar_width/2 for t in times], g_low_winners,
+ax.bar(w_times - bar_width/2, goertzel_low_max,
        width=bar_width, label='Goertzel Low Winner', color='#2196F3', alpha=0.8)
-ax.bar([t + bar_width/2 for t in times], g_high_winners,
+ax.bar(w_times + bar_width/2, goertzel_high_max,
        width=bar_width, label='Goertzel High Winner', color='#F44336', alpha=0.8)
 ax.set_ylabel('Goertzel Magnitude (linear)')
 ax.set_xlabel('Time (s)')
@@ -569,10 +730,8 @@ ax.set_yscale('log')
 ax.grid(True, alpha=0.3)
 ax.legend()
 
-plt.tight_layout()
 fn = 'band_magnitudes.png'
-plt.savefig(str(output_dir / fn), dpi=150)
-plt.close()
+fig.savefig(str(output_dir / fn), dpi=100, bbox_inches='tight', pad_inches=0.05)
 template_data['band_magnitudes_plot'] = fn
 print(f"Saved: {fn}")
 
@@ -581,48 +740,46 @@ print(f"Saved: {fn}")
 # ========================================================================
 print("Building per-window detail table...")
 
-window_table = []
-for w in windows:
-    if w['rms_db'] < energy_threshold_db:
-        continue
-
-    nearest_low = min(DTMF_LOW, key=lambda f: abs(f - w['low_peak_hz'])) if w['low_peak_hz'] > 0 else 0
-    nearest_high = min(DTMF_HIGH, key=lambda f: abs(f - w['high_peak_hz'])) if w['high_peak_hz'] > 0 else 0
-
-    g_low_idx = int(np.argmax(w['goertzel_low']))
-    g_high_idx = int(np.argmax(w['goertzel_high']))
-    g_low_freq = DTMF_LOW[g_low_idx]
-    g_high_freq = DTMF_HIGH[g_high_idx]
-    g_low_mag = w['goertzel_low'][g_low_idx]
-    g_high_mag = w['goertzel_high'][g_high_idx]
-
-    fft_digit = DTMF_MAP.get((nearest_low, nearest_high), '?')
-    goertzel_digit = DTMF_MAP.get((g_low_freq, g_high_freq), '?')
-
-    fft_twist = max(w['low_peak_mag'], w['high_peak_mag']) / max(min(w['low_peak_mag'], w['high_peak_mag']), 1e-10)
-    g_twist = max(g_low_mag, g_high_mag) / max(min(g_low_mag, g_high_mag), 1e-10)
-
-    window_table.append({
-        'time': w['time'],
-        'rms_db': w['rms_db'],
-        'fft_low_hz': w['low_peak_hz'],
-        'fft_low_mag': w['low_peak_mag'],
-        'fft_high_hz': w['high_peak_hz'],
-        'fft_high_mag': w['high_peak_mag'],
-        'fft_nearest_low': nearest_low,
-        'fft_nearest_high': nearest_high,
-        'fft_digit': fft_digit,
-        'fft_twist': fft_twist,
-        'g_low_freq': g_low_freq,
-        'g_low_mag': g_low_mag,
-        'g_high_freq': g_high_freq,
-        'g_high_mag': g_high_mag,
-        'g_digit': goertzel_digit,
-        'g_twist': g_twist,
-    })
+# Build the table column-wise over the active windows: one argmax/searchsorted
+# per column rather than a few tiny NumPy calls and lambdas per row.
+t_low_hz = low_peak_hz[active_idx]
+t_high_hz = high_peak_hz[active_idx]
+t_low_mag = low_peak_mag[active_idx].astype(np.float64)
+t_high_mag = high_peak_mag[active_idx].astype(np.float64)
+
+t_low_near = np.searchsorted(DTMF_LOW_MIDS, t_low_hz)
+t_high_near = np.searchsorted(DTMF_HIGH_MIDS, t_high_hz)
+t_has_peaks = (t_low_hz > 0) & (t_high_hz > 0)
+
+t_g_low_idx = goertzel_low_arg[active_idx]
+t_g_high_idx = goertzel_high_arg[active_idx]
+t_g_low_mag = goertzel_low_max[active_idx]
+t_g_high_mag = goertzel_high_max[active_idx]
+
+table_columns = {
+    'time': w_times[active_idx],
+    'rms_db': w_rms_db[active_idx],
+    'fft_low_hz': t_low_hz,
+    'fft_low_mag': t_low_mag,
+    'fft_high_hz': t_high_hz,
+    'fft_high_mag': t_high_mag,
+    'fft_nearest_low': np.where(t_low_hz > 0, DTMF_LOW_HZ[t_low_near], 0),
+    'fft_nearest_high': np.where(t_high_hz > 0, DTMF_HIGH_HZ[t_high_near], 0),
+    'fft_digit': np.where(t_has_peaks, DTMF_DIGITS[t_low_near, t_high_near], '?'),
+    'fft_twist': twist(t_low_mag, t_high_mag),
+    'g_low_freq': DTMF_LOW_HZ[t_g_low_idx],
+    'g_low_mag': t_g_low_mag,
+    'g_high_freq': DTMF_HIGH_HZ[t_g_high_idx],
+    'g_high_mag': t_g_high_mag,
+    'g_digit': DTMF_DIGITS[t_g_low_idx, t_g_high_idx],
+    'g_twist': twist(t_g_low_mag, t_g_high_mag),
+}
+# The table stays column-wise (tolist() hands the template plain Python
+# scalars); the template walks it with table_rows() one row dict at a time
+window_table = {name: col.tolist() for name, col in table_columns.items()}
 
 template_data['window_table'] = window_table
-print(f"  {len(window_table)} active windows in detail table")
+print(f"  {len(active_idx)} active windows in detail table")
 
 # ========================================================================
 # TONE REGION ANALYSIS
@@ -630,36 +787,32 @@ print(f"  {len(window_table)} active windows in detail table")
 print("Analyzing tone regions...")
 
 tone_region_analysis = []
-for idx, (r_start, r_end) in enumerate(tone_regions):
-    region_wins = [w for w in windows
-                   if r_start <= w['time'] <= r_end and w['rms_db'] >= energy_threshold_db]
-    if not region_wins:
-        continue
-
-    low_hz_vals = [round(w['low_peak_hz'], 1) for w in region_wins]
-    high_hz_vals = [round(w['high_peak_hz'], 1) for w in region_wins]
-    low_consensus = Counter(low_hz_vals).most_common(1)[0]
-    high_consensus = Counter(high_hz_vals).most_common(1)[0]
-
-    g_low_vals = [DTMF_LOW[int(np.argmax(w['goertzel_low']))] for w in region_wins]
-    g_high_vals = [DTMF_HIGH[int(np.argmax(w['goertzel_high']))] for w in region_wins]
-    g_low_consensus = Counter(g_low_vals).most_common(1)[0]
-    g_high_consensus = Counter(g_high_vals).most_common(1)[0]
-
-    fft_nearest_low = min(DTMF_LOW, key=lambda f: abs(f - low_consensus[0]))
-    fft_nearest_high = min(DTMF_HIGH, key=lambda f: abs(f - high_consensus[0]))
-    fft_digit = DTMF_MAP.get((fft_nearest_low, fft_nearest_high), '?')
-    g_digit = DTMF_MAP.get((g_low_consensus[0], g_high_consensus[0]), '?')
-
-    avg_low_mag = np.mean([w['low_peak_mag'] for w in region_wins])
-    avg_high_mag = np.mean([w['high_peak_mag'] for w in region_wins])
-    twist = max(avg_low_mag, avg_high_mag) / max(min(avg_low_mag, avg_high_mag), 1e-10)
+for idx, ((r_start, r_end), (start, end)) in enumerate(zip(tone_regions, region_runs)):
+    region_idx = slice(start, end)
+
+    low_consensus = most_common(value_counts(np.round(low_peak_hz[region_idx], 1)))
+    high_consensus = most_common(value_counts(np.round(high_peak_hz[region_idx], 1)))
+
+    # Vote on the Goertzel winner's band position (0-3) rather than its Hz
+    g_low_i, g_low_count = most_common(band_counts(goertzel_low_arg[region_idx]))
+    g_high_i, g_high_count = most_common(band_counts(goertzel_high_arg[region_idx]))
+
+    fft_low_i = np.searchsorted(DTMF_LOW_MIDS, low_consensus[0])
+    fft_high_i = np.searchsorted(DTMF_HIGH_MIDS, high_consensus[0])
+    fft_nearest_low = DTMF_LOW[fft_low_i]
+    fft_nearest_high = DTMF_HIGH[fft_high_i]
+    fft_digit = DTMF_DIGITS[fft_low_i, fft_high_i].item()
+    g_digit = DTMF_DIGITS[g_low_i, g_high_i].item()
+
+    avg_low_mag = np.mean(low_peak_mag[region_idx], dtype=np.float64)
+    avg_high_mag = np.mean(high_peak_mag[region_idx], dtype=np.float64)
+    region_twist = twist(avg_low_mag, avg_high_mag)
 
     tone_region_analysis.append({
         'region': idx + 1,
         'start': r_start, 'end': r_end,
         'duration': r_end - r_start,
-        'num_windows': len(region_wins),
+        'num_windows': end - start,
         'fft_low_hz': low_consensus[0],
         'fft_low_count': low_consensus[1],
         'fft_high_hz': high_consensus[0],
@@ -667,14 +820,14 @@ for idx, (r_start, r_end) in enumerate(tone_regions):
         'fft_nearest_low': fft_nearest_low,
         'fft_nearest_high': fft_nearest_high,
         'fft_digit': fft_digit,
-        'g_low_freq': g_low_consensus[0],
-        'g_low_count': g_low_consensus[1],
-        'g_high_freq': g_high_consensus[0],
-        'g_high_count': g_high_consensus[1],
+        'g_low_freq': DTMF_LOW[g_low_i],
+        'g_low_count': g_low_count,
+        'g_high_freq': DTMF_HIGH[g_high_i],
+        'g_high_count': g_high_count,
         'g_digit': g_digit,
         'avg_low_mag': avg_low_mag,
         'avg_high_mag': avg_high_mag,
-        'twist': twist,
+        'twist': region_twist,
     })
 
 template_data['tone_region_analysis'] = tone_region_analysis
@@ -692,10 +845,12 @@ print("Running diagnostics...")
 diagnostics = []
 
 # 1. Goertzel SNR
-if noise_windows:
-    noise_g_max = max(max(max(w['goertzel_low']), max(w['goertzel_high'])) for w in noise_windows)
-    if active_windows:
-        active_g_min = min(max(max(w['goertzel_low']), max(w['goertzel_high'])) for w in active_windows)
+# Reduce the per-window peaks under the gate masks (where=) rather than
+# copying the noise and active subsets out first
+if noise_spectra:
+    noise_g_max = goertzel_peak.max(where=~active_mask, initial=0.0)
+    if len(active_idx):
+        active_g_min = goertzel_peak.min(where=active_mask, initial=np.inf)
         snr_ratio = active_g_min / noise_g_max if noise_g_max > 0 else float('inf')
     else:
         active_g_min = 0
@@ -715,20 +870,20 @@ if noise_windows:
     })
 
 # 2. Threshold bug
-if noise_windows:
-    sample_noise_w = noise_windows[len(noise_windows)//2]
-    sample_i = int((sample_noise_w['time'] - window_ms / 2000) * rate)
+if noise_spectra:
+    sample_noise_j = noise_idx[len(noise_idx)//2]
+    sample_i = int((w_times[sample_noise_j] - window_ms / 2000) * rate)
     sample_i = max(0, sample_i)
     sample_chunk = data[sample_i:sample_i + window_n]
-    peak_amp_noise = int(np.max(np.abs(sample_chunk)))
+    peak_amp_noise = peak_abs(sample_chunk)
     threshold_10pct = peak_amp_noise * 0.1
     threshold_30pct = peak_amp_noise * 0.3
-    g_max_noise = max(max(sample_noise_w['goertzel_low']), max(sample_noise_w['goertzel_high']))
+    g_max_noise = goertzel_peak[sample_noise_j]
 
     diagnostics.append({
         'title': 'Threshold Bug — Why Noise Windows Detect DTMF',
         'description': (
-            f'In a noise window at t={sample_noise_w["time"]:.2f}s: '
+            f'In a noise window at t={w_times[sample_noise_j]:.2f}s: '
             f'peak amplitude = {peak_amp_noise}, '
             f'10% threshold = {threshold_10pct:.0f}, '
             f'30% threshold = {threshold_30pct:.0f}, '
@@ -748,24 +903,24 @@ if noise_windows:
     })
 
 # 3. Frequency consistency
-if active_windows:
-    low_fft_counts = Counter([round(w['low_peak_hz'], 1) for w in active_windows])
-    high_fft_counts = Counter([round(w['high_peak_hz'], 1) for w in active_windows])
-    low_g_counts = Counter([DTMF_LOW[int(np.argmax(w['goertzel_low']))] for w in active_windows])
-    high_g_counts = Counter([DTMF_HIGH[int(np.argmax(w['goertzel_high']))] for w in active_windows])
+if len(active_idx):
+    low_fft_top = dict(top_counts(value_counts(np.round(low_peak_hz[active_idx], 1)), 5))
+    high_fft_top = dict(top_counts(value_counts(np.round(high_peak_hz[active_idx], 1)), 5))
+    low_g_counts = {DTMF_LOW[i]: n for i, n in band_counts(goertzel_low_arg[active_idx]).items()}
+    high_g_counts = {DTMF_HIGH[i]: n for i, n in band_counts(goertzel_high_arg[active_idx]).items()}
 
     diagnostics.append({
         'title': 'Frequency Consistency in Active Windows',
         'description': (
-            f'FFT low-band peaks: {dict(low_fft_counts.most_common(5))}. '
-            f'FFT high-band peaks: {dict(high_fft_counts.most_common(5))}. '
-            f'Goertzel low winner: {dict(low_g_counts)}. '
-            f'Goertzel high winner: {dict(high_g_counts)}. '
+            f'FFT low-band peaks: {low_fft_top}. '
+            f'FFT high-band peaks: {high_fft_top}. '
+            f'Goertzel low winner: {low_g_counts}. '
+            f'Goertzel high winner: {high_g_counts}. '
         ),
-        'low_fft_histogram': dict(low_fft_counts.most_common(5)),
-        'high_fft_histogram': dict(high_fft_counts.most_common(5)),
-        'low_goertzel_histogram': dict(low_g_counts),
-        'high_goertzel_histogram': dict(high_g_counts),
+        'low_fft_histogram': low_fft_top,
+        'high_fft_histogram': high_fft_top,
+        'low_goertzel_histogram': low_g_counts,
+        'high_goertzel_histogram': high_g_counts,
     })
 
 template_data['diagnostics'] = diagnostics
@@ -775,13 +930,17 @@ template_data['diagnostics'] = diagnostics
 # ========================================================================
 print("Running energy-gated DTMF detection...")
 
-if noise_windows:
-    noise_goertzel_mags = [max(max(w['goertzel_low']), max(w['goertzel_high'])) for w in noise_windows]
-    noise_floor_g = float(np.percentile(noise_goertzel_mags, 95))
+if args.skip_quiet:
+    # The quiet windows were never run through the filters, so there is no
+    # floor to measure; the report says so instead of printing a default
+    noise_floor_g = None
+    abs_goertzel_threshold = None
 else:
-    noise_floor_g = 1000.0
-
-abs_goertzel_threshold = noise_floor_g * 10
+    if noise_spectra:
+        noise_floor_g = float(np.percentile(goertzel_peak[noise_idx], 95))
+    else:
+        noise_floor_g = 1000.0
+    abs_goertzel_threshold = noise_floor_g * 10
 
 # Use tone-region consensus for detection (proven accurate in analysis above)
 # This mirrors what a properly-debounced firmware detector would produce
@@ -800,8 +959,11 @@ template_data['gated_sequence'] = gated_sequence
 template_data['abs_goertzel_threshold'] = abs_goertzel_threshold
 template_data['noise_floor_goertzel'] = noise_floor_g
 
-print(f"  Noise floor Goertzel: {noise_floor_g:,.0f}")
-print(f"  Absolute threshold (10x noise): {abs_goertzel_threshold:,.0f}")
+if noise_floor_g is None:
+    print("  Noise floor Goertzel: not measured (--skip-quiet)")
+else:
+    print(f"  Noise floor Goertzel: {noise_floor_g:,.0f}")
+    print(f"  Absolute threshold (10x noise): {abs_goertzel_threshold:,.0f}")
 print(f"  Energy-gated sequence: {gated_sequence} ({len(gated_detections)} digits)")
 for d in gated_detections:
     print(f"    '{d['digit']}' at {d['start_time']:.2f}s - {d['end_time']:.2f}s ({d['duration']:.2f}s)")
@@ -814,12 +976,14 @@ template_path = script_dir / template_file
 
 if template_path.exists():
     print(f"\nRendering template: {template_file}")
-    env = Environment(loader=FileSystemLoader(str(script_dir)))
+    # The template is loaded once per run, so skip Jinja's up-to-date checks,
+    # and stream the report to disk instead of building it as one string
+    env = Environment(loader=FileSystemLoader(str(script_dir)), auto_reload=False)
+    env.globals['table_rows'] = table_rows
     template = env.get_template(template_file)
-    rendered = template.render(**template_data)
     output_file = output_dir / 'index.md'
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(rendered)
+        template.stream(**template_data).dump(f)
     print(f"Generated: {output_file}")
 else:
     print(f"Template not found: {template_path}")